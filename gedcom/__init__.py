@@ -4,13 +4,20 @@ Library for reading and writing GEDCOM files.
 https://en.wikipedia.org/wiki/GEDCOM
 """
 import re
-import numbers
+import codecs
+import errno
+import functools
+import itertools
 import os.path
-import six
+import sys
 
 from ._version import __version__
 
-line_format = re.compile("^(?P<level>[0-9]+) ((?P<id>@[-a-zA-Z0-9]+@) )?(?P<tag>[_A-Z0-9]+)( (?P<value>.*))?$")
+# Matches one whole line, including leading blank lines/whitespace and its
+# line ending, so that one findall() call tokenizes each block of whole lines
+# (see _whole_lines) into (level, id, tag, value, invalid) tuples. Any line
+# that isn't a valid GEDCOM line ends up in the ``invalid`` group.
+line_format = re.compile("\\s*(?:(?P<level>[0-9]+) (?:(?P<id>@[-a-zA-Z0-9]+@) )?(?P<tag>[_A-Z0-9]+)(?: (?P<value>[^\r\n]*[^\\s]))?[^\\S\r\n]*(?:\r\n?|\n|$)|(?P<invalid>[^\r\n]+))")
 
 
 class GedcomFile(object):
@@ -19,8 +26,12 @@ class GedcomFile(object):
     def __init__(self):
         """Instanciate a GEDCOM object."""
         self.root_elements = []
+        self._individuals = []
+        self._families = []
         self.pointers = {}
         self.next_free_id = 1
+        # Bumped whenever the file is changed, see memoized_property
+        self._generation = 0
 
     def __repr__(self):
         """String represenation of GEDCOM. For internal debugging purposes only."""
@@ -47,7 +58,7 @@ class GedcomFile(object):
         """
         if element.level is None:
             # Need to figure out an element
-            if not (isinstance(element, Individual) or isinstance(element, Family) or element.tag in ['INDI', 'FAM']):
+            if not (isinstance(element, Individual) or isinstance(element, Family) or element.tag in ('INDI', 'FAM')):
                 raise TypeError()
             element.level = 0
             element.set_levels_downward()
@@ -60,26 +71,27 @@ class GedcomFile(object):
             else:
                 raise NotImplementedError()
 
-            for step in range(1, 1000000):
-                potential_id = "@{prefix}{num}@".format(prefix=prefix, num=self.next_free_id)
-                if potential_id in self.pointers:
-                    # this number is taken, increase
-                    self.next_free_id += 1
-                else:
-                    # Found a free id
-                    element.id = potential_id
-                    self.next_free_id += 1
-                    break
-            else:
-                # Tried 1,000,000 times and didn't have a free id? weird!
-                # prevents an infinite loop
-                raise Exception("Ran out of ids?")
-
-        element.gedcom_file = self
+            # next_free_id only ever goes up, so each number is tried at most
+            # once over the life of this file.
+            potential_id = "@{0}{1}@".format(prefix, self.next_free_id)
+            while potential_id in self.pointers:
+                # this number is taken, increase
+                self.next_free_id += 1
+                potential_id = "@{0}{1}@".format(prefix, self.next_free_id)
+            element.id = potential_id
+            self.next_free_id += 1
+
+        if element.gedcom_file is not self:
+            element.set_gedcom_file(self)
+        self._generation += 1
         if element.id:
             self.pointers[element.id] = element
         if element.level == 0:
             self.root_elements.append(element)
+            if isinstance(element, Individual):
+                self._individuals.append(element)
+            elif isinstance(element, Family):
+                self._families.append(element)
 
     @property
     def individuals(self):
@@ -89,7 +101,7 @@ class GedcomFile(object):
         :returns: iterator of Individual's
         :rtype: iterator
         """
-        return (i for i in self.root_elements if isinstance(i, Individual))
+        return iter(self._individuals)
 
     @property
     def families(self):
@@ -99,7 +111,7 @@ class GedcomFile(object):
         :returns: iterator of Families's
         :rtype: iterator
         """
-        return (i for i in self.root_elements if isinstance(i, Family))
+        return iter(self._families)
 
     def gedcom_lines(self):
         """
@@ -108,11 +120,8 @@ class GedcomFile(object):
         :returns: iterator over lines
         :rtype: iterator
         """
-        self.ensure_header_trailer()
-        self.ensure_levels()
-        for el in self.root_elements:
-            for line in el.gedcom_lines():
-                yield line
+        for lines in self._root_element_lines():
+            yield from lines
 
     def gedcom_lines_as_string(self):
         """
@@ -121,7 +130,7 @@ class GedcomFile(object):
         :returns: Full encoded text of this file
         :rtype: string
         """
-        return "\n".join(self.gedcom_lines())
+        return "\n".join(itertools.chain.from_iterable(self._root_element_lines()))
 
     def save(self, fileout):
         """
@@ -130,7 +139,7 @@ class GedcomFile(object):
         :param fileout: Filename or open file-like object to save this to.
         :raises Exception: if the filename exists
         """
-        if isinstance(fileout, six.string_types):
+        if isinstance(fileout, str):
             if os.path.exists(fileout):
                 # TODO better exception
                 raise Exception("File exists")
@@ -138,9 +147,29 @@ class GedcomFile(object):
                 with open(fileout, "wb") as fp:
                     return self.save(fp)
 
-        for line in self.gedcom_lines():
-            fileout.write(line.encode("utf8"))
-            fileout.write("\n".encode("utf8"))
+        # Encode and write lines in batches, not one at a time
+        lines = []
+        for el_lines in self._root_element_lines():
+            lines.extend(el_lines)
+            if len(lines) >= _WRITE_BATCH:
+                lines.append("")
+                fileout.write("\n".join(lines).encode("utf8"))
+                lines = []
+        if lines:
+            lines.append("")
+            fileout.write("\n".join(lines).encode("utf8"))
+
+    def _root_element_lines(self):
+        """
+        Iterator over the encoded lines of each root element in turn, one list per element.
+
+        Adds the header/trailer if needed, and sets the levels as it goes.
+        """
+        self.ensure_header_trailer()
+        for el in self.root_elements:
+            lines = []
+            el._emit(lines, 0)
+            yield lines
 
     def ensure_header_trailer(self):
         """
@@ -210,6 +239,8 @@ class Element(object):
     Can be used as is, or subclassed for specific functionality.
     """
 
+    __slots__ = ('level', 'tag', 'value', 'id', 'parent_id', 'parent_element', 'child_elements', '_tag_index', 'gedcom_file')
+
     def __init__(self, level=None, tag=None, value=None, id=None, parent_id=None, parent=None, gedcom_file=None):
         """
         Create an element.
@@ -226,11 +257,16 @@ class Element(object):
             if hasattr(self, 'default_tag'):
                 if tag != self.default_tag:
                     raise ValueError("Tag {} differs from default {}".format(tag, self.default_tag))
-            self.tag = tag
+                # Already interned by register_tag
+                self.tag = self.default_tag
+            else:
+                self.tag = sys.intern(tag)
         else:
             self.tag = self.default_tag
         self.value = value
         self.child_elements = []
+        # tag -> list of child elements, built when first needed, see _children_with_tag
+        self._tag_index = None
         self.parent_element = parent
         self.id = id
         self.parent_id = parent_id
@@ -254,13 +290,13 @@ class Element(object):
         :returns: Element
         :rtype: Element (or subclass)
         """
-        children = [c for c in self.child_elements if c.tag == key]
-        if len(children) == 0:
+        children = self._children_with_tag(key)
+        if not children:
             raise IndexError(key)
         elif len(children) == 1:
             return children[0]
-        elif len(children) > 1:
-            return children
+        else:
+            return list(children)
 
     def __contains__(self, key):
         """
@@ -268,22 +304,60 @@ class Element(object):
 
         :param str key: Tag to look for.
         """
-        return any(c.tag == key for c in self.child_elements)
+        return len(self._children_with_tag(key)) > 0
 
     def add_child_element(self, child_element):
         """
         Add `child_element` as a child of this.
 
         It sets the :py:attr:`parent` and :py:attr:`parent_id` of `child_element` to this
-        element, but does not set the :py:meth:`level`. See
-        :py:meth:`set_levels_downward` to correct that.
+        element, and puts it (and its children) in the same file as this element, but does not set
+        the :py:meth:`level`. See :py:meth:`set_levels_downward` to correct that.
 
         :param Element child_element: The Element you want to add as a child.
         """
-        child_element.parent = self
+        child_element.parent_element = self
         child_element.parent_id = self.id
-        child_element.gedcom_file = self.gedcom_file
+        if child_element.gedcom_file is not self.gedcom_file:
+            child_element.set_gedcom_file(self.gedcom_file)
+        if self.gedcom_file is not None:
+            self.gedcom_file._generation += 1
         self.child_elements.append(child_element)
+        if self._tag_index is not None:
+            self._tag_index.setdefault(child_element.tag, []).append(child_element)
+
+    def _children_with_tag(self, tag):
+        """
+        Return the child elements with this tag, as a sequence which must not be changed.
+
+        Most elements have only a handful of children, and scanning them is cheaper than building
+        a dict, so the tag index is only built for elements with at least `_INDEX_MIN_CHILDREN`.
+        """
+        index = self._tag_index
+        if index is None:
+            children = self.child_elements
+            if len(children) < _INDEX_MIN_CHILDREN:
+                return [c for c in children if c.tag == tag]
+            index = {}
+            for c in children:
+                index.setdefault(c.tag, []).append(c)
+            self._tag_index = index
+        return index.get(tag, ())
+
+    def invalidate(self):
+        """
+        Throw away cached values, like :py:attr:`Individual.parents`, for every element in this element's file.
+
+        Call this after changing an element directly (e.g. setting :py:attr:`value` or :py:attr:`tag`, or
+        changing :py:attr:`child_elements`), rather than with methods like :py:meth:`add_child_element`
+        which do this already. It also throws away the lookup of child elements by tag for this element
+        and its parent.
+        """
+        self._tag_index = None
+        if self.parent_element is not None:
+            self.parent_element._tag_index = None
+        if self.gedcom_file is not None:
+            self.gedcom_file._generation += 1
 
     def get_by_id(self, other_id):
         """
@@ -304,29 +378,70 @@ class Element(object):
         :returns: list of any child nodes that have this tag
         :rtype: list
         """
-        return [c for c in self.child_elements if c.tag == tag]
+        return list(self._children_with_tag(tag))
 
     def set_levels_downward(self):
         """Set all :py:attr:`level` attributes for all child elements recursively, based on the :py:attr:`level` for this object."""
-        if not isinstance(self.level, numbers.Integral):
+        if not isinstance(self.level, int):
             raise TypeError(self.level)
+        # Walk the tree with a worklist rather than recursing. Only this
+        # element's level needs checking, all the ones below are set here.
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            if element.child_elements:
+                level = element.level + 1
+                for c in element.child_elements:
+                    c.level = level
+                stack.extend(element.child_elements)
+
+    def set_gedcom_file(self, gedcom_file):
+        """
+        Set the :py:attr:`gedcom_file` of this element, and all child elements recursively.
+
+        :param GedcomFile gedcom_file: File this element is now in
+        """
+        self.gedcom_file = gedcom_file
         for c in self.child_elements:
-            c.level = self.level + 1
-            c.gedcom_file = self.gedcom_file
-            c.set_levels_downward()
+            c.set_gedcom_file(gedcom_file)
 
     def gedcom_lines(self):
         """
         Iterator over the encoded lines for this element.
 
+        Each line uses that element's current :py:attr:`level`, which is left unchanged.
+
         :rtype: iterator over string
         """
-        line_format = re.compile("^(?P<level>[0-9]+) ((?P<id>@[a-zA-Z0-9]+@) )?(?P<tag>[A-Z]+)( (?P<value>.*))?$")
-        line = u"{level}{id} {tag}{value}".format(level=self.level, id=(" " + self.id if self.id else ""), tag=self.tag, value=(" " + self.value if self.value else ""))
-        yield line
+        yield self._line(self.level)
+        for child in self.child_elements:
+            yield from child.gedcom_lines()
+
+    def _line(self, level):
+        """Return the encoded line for this element alone, at `level`."""
+        # One format string per combination of id/value, rather than building
+        # the optional parts separately and then formatting them in.
+        if self.id:
+            if self.value:
+                return u"%s %s %s %s" % (level, self.id, self.tag, self.value)
+            return u"%s %s %s" % (level, self.id, self.tag)
+        elif self.value:
+            return u"%s %s %s" % (level, self.tag, self.value)
+        return u"%s %s" % (level, self.tag)
+
+    def _emit(self, out, level):
+        """
+        Append the encoded lines for this element, and all child elements, to the list `out`.
+
+        Only for writing out a whole :py:class:`GedcomFile`. Sets the :py:attr:`level` of this
+        element to `level`, and of the child elements to match, as it goes, so that writing out a
+        file takes one walk over it rather than a separate one for :py:meth:`set_levels_downward`.
+        """
+        self.level = level
+        out.append(self._line(level))
+        level += 1
         for child in self.child_elements:
-            for line in child.gedcom_lines():
-                yield line
+            child._emit(out, level)
 
     @property
     def note(self):
@@ -347,17 +462,73 @@ tags_to_classes = {}
 def register_tag(tag):
     """Internal class decorator to mark a python class as to be the handler for this tag."""
     def classdecorator(klass):
-        global tags_to_classes
         tags_to_classes[tag] = klass
-        klass.default_tag = tag
+        klass.default_tag = sys.intern(tag)
         return klass
     return classdecorator
 
 
+def split_name(value):
+    """
+    Split the value of a NAME tag, e.g. "Robert /Cox/", into first name and last name.
+
+    :param str value: Name, with the last name between slashes
+    :returns: (firstname, lastname), lastname is None if there are no slashes
+    :raises ValueError: If the last name has no closing slash
+    """
+    first, slash, rest = value.partition("/")
+    if not slash:
+        # Only first name
+        return first.strip(), None
+    last, slash, _ = rest.partition("/")
+    if not slash:
+        # malformed line
+        raise ValueError("Name {0!r} has no closing '/'".format(value))
+    return first.strip(), last.strip()
+
+
+# Marks a value that isn't in a memoized_property cache, since None is a valid value
+_MISSING = object()
+
+
+def memoized_property(func):
+    """
+    Internal decorator, like ``property``, but which caches the result on the instance.
+
+    The cache is thrown away whenever the :py:class:`GedcomFile` the element is in is changed by
+    :py:meth:`GedcomFile.add_element`, :py:meth:`Element.add_child_element` or similar, or when
+    :py:meth:`Element.invalidate` is called. The class needs a ``_cache`` slot. Elements which are
+    not in a file are not cached.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def getter(self):
+        if self.gedcom_file is None:
+            return func(self)
+        generation = self.gedcom_file._generation
+        try:
+            cache_generation, cache = self._cache
+        except AttributeError:
+            cache_generation, cache = None, None
+        if cache_generation != generation:
+            cache = {}
+            self._cache = (generation, cache)
+        result = cache.get(name, _MISSING)
+        if result is _MISSING:
+            # Outside of any except block, so errors from func aren't chained onto a KeyError
+            result = cache[name] = func(self)
+        return result
+
+    return property(getter)
+
+
 @register_tag("INDI")
 class Individual(Element):
     """Represents and INDI (Individual) element."""
 
+    __slots__ = ('_cache',)
+
     @property
     def parents(self):
         """
@@ -365,8 +536,16 @@ class Individual(Element):
 
         NB: There may be 0, 1, 2, 3, ... elements in this list.
 
+        This is cached. After changing the FAMC, family or partner elements directly, call
+        :py:meth:`invalidate`, or this may still return the old parents.
+
         :returns: List of Individual's
         """
+        return list(self._parents)
+
+    @memoized_property
+    def _parents(self):
+        """Cached list of parents, see :py:attr:`parents`."""
         if 'FAMC' in self:
             family_as_child_id = self['FAMC'].value
             family = self.get_by_id(family_as_child_id)
@@ -379,12 +558,16 @@ class Individual(Element):
         else:
             return []
 
-    @property
+    @memoized_property
     def name(self):
         """
         Return this person's name.
 
         Returns a tuple of (firstname, lastname). If firstname or lastname isn't in the file, then None is returned.
+
+        This is cached. After changing the name elements directly (e.g. setting their :py:attr:`value`),
+        call :py:meth:`invalidate`, or this may still return the old name.
+
         :returns: (firstname, lastname)
         """
         name_tag = self['NAME']
@@ -412,21 +595,7 @@ class Individual(Element):
             except IndexError:
                 last = None
         else:
-            vals = preferred_name.value.split("/")
-            assert len(vals) > 0
-            if len(vals) == 1:
-                # Only first name
-                first = vals[0].strip()
-                last = None
-            elif len(vals) == 2:
-                # malformed line
-                raise Exception
-            elif len(vals) == 3:
-                # Normal
-                first, last, dud = vals
-
-                first = first.strip()
-                last = last.strip()
+            first, last = split_name(preferred_name.value)
 
         return first, last
 
@@ -445,9 +614,7 @@ class Individual(Element):
                         first = name['GIVN'].value
                         last = name['SURN'].value
                     else:
-                        first, last, dud = name.value.split("/")
-                        first = first.strip()
-                        last = last.strip()
+                        first, last = split_name(name.value)
                     aka_list.append((first, last))
 
         return aka_list
@@ -484,18 +651,21 @@ class Individual(Element):
         """
         return self['SEX'].value
 
-    @property
+    @memoized_property
     def father(self):
         """
         Calculate and return the individual represenating the father of this person.
 
         Returns `None` if none found.
 
+        This is cached. After changing the parents' elements directly (e.g. their SEX), call
+        :py:meth:`invalidate`, or this may still return the old answer.
+
         :return: the father, or `None` if not in file.
         :raises NotImplementedError: If it cannot figure out who's the father.
         :rtype: :py:class:`Individual`
         """
-        male_parents = [p for p in self.parents if p.is_male]
+        male_parents = [p for p in self._parents if p.is_male]
         if len(male_parents) == 0:
             return None
         elif len(male_parents) == 1:
@@ -503,18 +673,21 @@ class Individual(Element):
         elif len(male_parents) > 1:
             raise NotImplementedError()
 
-    @property
+    @memoized_property
     def mother(self):
         """
         Calculate and return the individual represenating the mother of this person.
 
         Returns `None` if none found.
 
+        This is cached. After changing the parents' elements directly (e.g. their SEX), call
+        :py:meth:`invalidate`, or this may still return the old answer.
+
         :return: the mother, or `None` if not in file.
         :raises NotImplementedError: If it cannot figure out who's the mother.
         :rtype: :py:class:`Individual`
         """
-        female_parents = [p for p in self.parents if p.is_female]
+        female_parents = [p for p in self._parents if p.is_female]
         if len(female_parents) == 0:
             return None
         elif len(female_parents) == 1:
@@ -522,14 +695,24 @@ class Individual(Element):
         elif len(female_parents) > 1:
             raise NotImplementedError()
 
-    @property
+    @memoized_property
     def is_female(self):
-        """Return True iff this person is recorded as female."""
+        """
+        Return True iff this person is recorded as female.
+
+        This is cached. :py:meth:`set_sex` keeps it up to date, but after changing the SEX element
+        directly, call :py:meth:`invalidate`, or this may still return the old answer.
+        """
         return self.sex.lower() == 'f'
 
-    @property
+    @memoized_property
     def is_male(self):
-        """Return True iff this person is recorded as male."""
+        """
+        Return True iff this person is recorded as male.
+
+        This is cached. :py:meth:`set_sex` keeps it up to date, but after changing the SEX element
+        directly, call :py:meth:`invalidate`, or this may still return the old answer.
+        """
         return self.sex.lower() == 'm'
 
     def set_sex(self, sex):
@@ -545,6 +728,7 @@ class Individual(Element):
         try:
             sex_node = self['SEX']
             sex_node.value = sex
+            self.invalidate()
         except IndexError:
             self.add_child_element(self.gedcom_file.element("SEX", value=sex))
 
@@ -561,6 +745,8 @@ class Individual(Element):
 class Family(Element):
     """Represents a family 'FAM' tag."""
 
+    __slots__ = ()
+
     @property
     def partners(self):
         """
@@ -595,6 +781,8 @@ class Family(Element):
 class Spouse(Element):
     """Generic base class for HUSB/WIFE."""
 
+    __slots__ = ()
+
     def as_individual(self):
         """
         Return the :py:class:`Individual` for this object.
@@ -610,19 +798,21 @@ class Spouse(Element):
 class Husband(Spouse):
     """Represents pointer to a husband in a family."""
 
-    pass
+    __slots__ = ()
 
 
 @register_tag("WIFE")
 class Wife(Spouse):
     """Represents pointer to a wife in a family."""
 
-    pass
+    __slots__ = ()
 
 
 class Event(Element):
     """Generic base class for events, like :py:class:`Birth` (BIRT) etc."""
 
+    __slots__ = ()
+
     @property
     def date(self):
         """
@@ -650,27 +840,29 @@ class Event(Element):
 class Birth(Event):
     """Represents a birth (BIRT)."""
 
-    pass
+    __slots__ = ()
 
 
 @register_tag("DEAT")
 class Death(Event):
     """Represents a death (DEAT)."""
 
-    pass
+    __slots__ = ()
 
 
 @register_tag("MARR")
 class Marriage(Event):
     """Represents a marriage (MARR)."""
 
-    pass
+    __slots__ = ()
 
 
 @register_tag("NOTE")
 class Note(Element):
     """Represents a note (NOTE)."""
 
+    __slots__ = ()
+
     @property
     def full_text(self):
         """
@@ -680,18 +872,18 @@ class Note(Element):
         CONT/CONS child nodes that store the other lines. This method assembles
         these elements into one continuusous string.
         """
-        result = "" + self.value or ''
+        parts = [self.value or '']
 
         for cons in self.child_elements:
             if cons.tag == 'CONT':
-                result += "\n"
-                result += cons.value or ''
+                parts.append("\n")
+                parts.append(cons.value or '')
             elif cons.tag == 'CONC':
-                result += cons.value or ''
+                parts.append(cons.value or '')
             else:
                 raise ValueError("Full text can only consist of CONS and CONT")
 
-        return result
+        return "".join(parts)
 
 
 def class_for_tag(tag):
@@ -701,7 +893,6 @@ def class_for_tag(tag):
     :param str tag: tag (e.g. INDI)
     :rtype: class (Element or something that's a subclass)
     """
-    global tags_to_classes
     return tags_to_classes.get(tag, Element)
 
 
@@ -721,8 +912,8 @@ def parse_filename(filename):
     :param string filename: Filename to parse
     :returns: GedcomFile instance
     """
-    with open(filename, 'r') as fp:
-        return __parse(fp.readlines())
+    with open(filename, 'rb') as fp:
+        return __parse(_read_blocks(fp))
 
 
 def parse_string(string):
@@ -732,17 +923,19 @@ def parse_string(string):
     :param str string: Filename to parse
     :returns: GedcomFile instance
     """
-    return __parse(string.split("\n"))
+    return __parse([string])
 
 
 def parse_fp(file_fp):
     """
     Parse file and return GedcomFile.
 
+    Files opened in binary mode are decoded as UTF-8.
+
     :param filehandle file_fp: open file handle for input
     :returns: GedcomFile
     """
-    return __parse(file_fp.readlines())
+    return __parse(_read_blocks(file_fp))
 
 
 def parse(obj):
@@ -751,43 +944,105 @@ def parse(obj):
 
     If it's a filename, it calls :py:func:`parse_filename`, for file-like objects, :py:mod:`parse_fp`, for strings, calls :py:mod:`parse_string`.
 
-    :param obj: filename, open file-like object or string contents of GEDCOM file
+    :param obj: filename, open file-like object, string or UTF-8 encoded bytes contents of GEDCOM file
     :returns: GedcomFile
     """
-    if isinstance(obj, six.string_types):
-        # Sanity check, presumes anything > 1KB could not be a filename
-        if len(obj) <= 1024 and os.path.exists(obj):
-            return parse_filename(obj)
-        else:
+    if isinstance(obj, (bytes, bytearray)):
+        # Same as files, a leading UTF-8 BOM is skipped
+        return parse_string(obj.decode("utf-8-sig"))
+    elif isinstance(obj, str):
+        if "\n" in obj:
+            # Any GEDCOM file is more than one line, and filenames don't have newlines
+            return parse_string(obj)
+        # Rather than checking if the file exists first, just try to open it
+        try:
+            fp = open(obj, 'rb')
+        except (TypeError, ValueError):
+            # e.g. null byte in it, can't be a filename (Python < 3.5 raises TypeError for that)
+            return parse_string(obj)
+        except OSError as error:
+            if error.errno not in (errno.ENOENT, errno.ENAMETOOLONG):
+                raise
             return parse_string(obj)
+        with fp:
+            return parse_fp(fp)
     else:
         return parse_fp(obj)
 
 
-def __parse(lines_iter):
-    current_level = 0
-    level_to_obj = {}
-    gedcom_file = GedcomFile()
+# How much of a file is read (and scanned with line_format) at a time
+_READ_SIZE = 64 * 1024
+# Roughly how many lines are encoded and written at a time when saving
+_WRITE_BATCH = 10000
 
-    for linenum, line in enumerate(lines_iter):
-        line = line.strip()
-        if line == '':
-            continue
-        match = line_format.match(line)
-        if not match:
-            raise NotImplementedError(line)
 
-        level = int(match.groupdict()['level'])
+def _read_blocks(file_fp):
+    """
+    Iterator over the contents of `file_fp`, :py:data:`_READ_SIZE` characters/bytes at a time.
 
-        if level == 0:
-            parent = None
-        else:
-            level_to_obj = dict((l, obj) for l, obj in level_to_obj.items() if l < level)
-            parent = level_to_obj[level - 1]
+    If `file_fp` returns bytes, they are decoded as UTF-8 (skipping any byte order mark) here, a
+    block at a time, which is quicker than letting a text mode file do it.
+    """
+    decoder = None
+    while True:
+        block = file_fp.read(_READ_SIZE)
+        if not block:
+            break
+        if isinstance(block, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            block = decoder.decode(block)
+        yield block
+    if decoder is not None:
+        # Raises an error if the file ends part way through a character
+        decoder.decode(b"", final=True)
+
+
+def _whole_lines(blocks):
+    """
+    Regroup `blocks` of text so that no line is split across them.
+
+    :param blocks: iterable of strings, which can break anywhere
+    :returns: iterator of (text, end) tuples, ``text[:end]`` is only whole lines
+    """
+    leftover = ''
+    for block in blocks:
+        text = leftover + block if leftover else block
+        end = max(text.rfind('\n'), text.rfind('\r')) + 1
+        yield text, end
+        leftover = text[end:]
+    if leftover:
+        yield leftover, len(leftover)
+
+
+def __parse(blocks):
+    # stack[n] is the most recent element at level n
+    stack = []
+    gedcom_file = GedcomFile()
+    # Look these up once, rather than for every line. tag_to_class is the
+    # same as class_for_tag, but without a function call per line.
+    tag_to_class = tags_to_classes.get
+    add_element = gedcom_file.add_element
+    push = stack.append
+
+    for text, end in _whole_lines(blocks):
+        for level, id, tag, value, invalid in line_format.findall(text, 0, end):
+            if invalid:
+                raise NotImplementedError(invalid.strip())
+
+            # Levels are nearly always one digit, which is quicker to convert by hand
+            level = ord(level) - 48 if len(level) == 1 else int(level)
+
+            del stack[level:]
+            if level == 0:
+                parent = None
+            else:
+                parent = stack[level - 1]
 
-        element = line_to_element(level=level, parent=parent, tag=match.groupdict()['tag'], value=match.groupdict()['value'], id=match.groupdict()['id'])
-        level_to_obj[level] = element
-        element.gedcom_file = gedcom_file
-        gedcom_file.add_element(element)
+            element = tag_to_class(tag, Element)(level=level, parent=parent, tag=tag, value=value or None, id=id or None, gedcom_file=gedcom_file)
+            push(element)
+            add_element(element)
 
     return gedcom_file
+# Elements with fewer children than this are scanned for a tag, rather than indexed
+_INDEX_MIN_CHILDREN = 32
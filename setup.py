@@ -14,10 +14,10 @@ setup(
     author="Rory McCann",
     author_email="rory@technomancy.org",
     classifiers=[
-        'Programming Language :: Python :: 2.5',
-        'Programming Language :: Python :: 2.6',
-        'Programming Language :: Python :: 2.7',
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: 3.3',
+        'Programming Language :: Python :: 3.4',
         'License :: OSI Approved :: GNU General Public License v3 or later (GPLv3+)',
         'Intended Audience :: Developers',
         'Development Status :: 4 - Beta',
@@ -25,7 +25,5 @@ setup(
         'Topic :: Sociology :: History',
         'Topic :: Text Processing',
       ],
-    install_requires = [
-        'six',
-    ]
+    python_requires='>=3.3',
 )
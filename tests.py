@@ -1,6 +1,7 @@
 import unittest
 import gedcom
-import six
+import io
+import codecs
 import tempfile
 from os import remove
 
@@ -46,54 +47,72 @@ GEDCOM_FILE = """0 HEAD
 1 CHIL @I3@
 0 TRLR
 """
+GEDCOM_FILE_UTF8 = GEDCOM_FILE.encode("utf8")
+
+# One person, with their name in GIVN/SURN child elements
+BOB_COX_GIVN_SURN = "0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n\n0 TRLR"
+
+
+_VERSION = gedcom.__version__
+
 
 def v(string):
-    return string.format(version=gedcom.__version__)
+    return string.replace("{version}", _VERSION)
+
+
+def first_individual(gedcomfile):
+    return next(iter(gedcomfile.individuals))
 
 
 class GedComTestCase(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Shared by the tests which only read GEDCOM_FILE. Tests which change
+        # it, or which test parsing itself, parse their own copy.
+        cls.parsed_gedcomfile = gedcom.parse_string(GEDCOM_FILE)
+
     def testCanParse(self):
-        parsed = gedcom.parse_string(GEDCOM_FILE)
+        parsed = self.parsed_gedcomfile
         self.assertTrue(isinstance(parsed, gedcom.GedcomFile))
 
         people = list(parsed.individuals)
         self.assertTrue(len(people), 3)
 
         bob = people[0]
-        self.assertEquals(bob.name, ("Robert", "Cox"))
-        self.assertEquals(bob.aka, [("Bob", "Cox"), ('Rob', 'Cox')])
-        self.assertEquals(bob.sex, 'M')
-        self.assertEquals(bob.gender, 'M')
+        self.assertEqual(bob.name, ("Robert", "Cox"))
+        self.assertEqual(bob.aka, [("Bob", "Cox"), ('Rob', 'Cox')])
+        self.assertEqual(bob.sex, 'M')
+        self.assertEqual(bob.gender, 'M')
         self.assertTrue(bob.is_male)
         self.assertFalse(bob.is_female)
-        self.assertEquals(bob.parents, [])
-        self.assertEquals(bob.father, None)
-        self.assertEquals(bob.mother, None)
+        self.assertEqual(bob.parents, [])
+        self.assertEqual(bob.father, None)
+        self.assertEqual(bob.mother, None)
 
         joann = people[1]
-        self.assertEquals(joann.name, ("Joann", "Para"))
-        self.assertEquals(joann.sex, 'F')
-        self.assertEquals(joann.gender, 'F')
+        self.assertEqual(joann.name, ("Joann", "Para"))
+        self.assertEqual(joann.sex, 'F')
+        self.assertEqual(joann.gender, 'F')
         self.assertFalse(joann.is_male)
         self.assertTrue(joann.is_female)
-        self.assertEquals(joann.parents, [])
+        self.assertEqual(joann.parents, [])
 
         bobby_jo = people[2]
-        self.assertEquals(bobby_jo.name, ("Bobby Jo", "Cox"))
-        self.assertEquals(bobby_jo.sex, 'M')
-        self.assertEquals(bobby_jo.gender, 'M')
+        self.assertEqual(bobby_jo.name, ("Bobby Jo", "Cox"))
+        self.assertEqual(bobby_jo.sex, 'M')
+        self.assertEqual(bobby_jo.gender, 'M')
         self.assertTrue(bobby_jo.is_male)
         self.assertFalse(bobby_jo.is_female)
-        self.assertEquals(bobby_jo.parents, [bob, joann])
-        self.assertEquals(bobby_jo.father, bob)
-        self.assertEquals(bobby_jo.mother, joann)
+        self.assertEqual(bobby_jo.parents, [bob, joann])
+        self.assertEqual(bobby_jo.father, bob)
+        self.assertEqual(bobby_jo.mother, joann)
 
         families = list(parsed.families)
-        self.assertEquals(len(families), 1)
+        self.assertEqual(len(families), 1)
         family = families[0]
-        self.assertEquals(family.__class__, gedcom.Family)
-        self.assertEquals([p.as_individual() for p in family.partners], [bob, joann])
+        self.assertEqual(family.__class__, gedcom.Family)
+        self.assertEqual([p.as_individual() for p in family.partners], [bob, joann])
 
     def testCreateEmpty(self):
         gedcomfile = gedcom.GedcomFile()
@@ -104,20 +123,30 @@ class GedComTestCase(unittest.TestCase):
         gedcomfile = gedcom.GedcomFile()
         individual = gedcomfile.individual()
         individual.set_sex("M")
-        self.assertEquals(individual.level, 0)
+        self.assertEqual(individual.level, 0)
 
-        self.assertEquals(list(gedcomfile.individuals)[0], individual)
+        self.assertEqual(first_individual(gedcomfile), individual)
 
-        self.assertEquals(individual.tag, 'INDI')
-        self.assertEquals(individual.level, 0)
-        self.assertEquals(individual.note, None)
+        self.assertEqual(individual.tag, 'INDI')
+        self.assertEqual(individual.level, 0)
+        self.assertEqual(individual.note, None)
 
         family = gedcomfile.family()
 
-        self.assertEquals(family.tag, 'FAM')
-        self.assertEquals(family.level, 0)
+        self.assertEqual(family.tag, 'FAM')
+        self.assertEqual(family.level, 0)
 
         self.assertEqual(gedcomfile.gedcom_lines_as_string(), v('0 HEAD\n1 SOUR\n2 NAME gedcompy\n2 VERS {version}\n1 CHAR UNICODE\n1 GEDC\n2 VERS 5.5\n2 FORM LINEAGE-LINKED\n0 @I1@ INDI\n1 SEX M\n0 @F2@ FAM\n0 TRLR'))
+        self.assertEqual([(e.level, e.tag) for e in gedcomfile.root_elements], [(0, 'HEAD'), (0, 'INDI'), (0, 'FAM'), (0, 'TRLR')])
+        self.assertEqual([(e.level, e.tag, e.value) for e in individual.child_elements], [(1, 'SEX', 'M')])
+        self.assertEqual(family.child_elements, [])
+
+    def testRepr(self):
+        gedcomfile = gedcom.GedcomFile()
+        gedcomfile.individual().set_sex("M")
+        gedcomfile.family()
+        # Writing it out adds the HEAD/TRLR and sets the levels
+        gedcomfile.gedcom_lines_as_string()
         self.assertEqual(repr(gedcomfile), v("GedcomFile(\nElement(0, 'HEAD', [Element(1, 'SOUR', [Element(2, 'NAME', 'gedcompy'), Element(2, 'VERS', '{version}')]), Element(1, 'CHAR', 'UNICODE'), Element(1, 'GEDC', [Element(2, 'VERS', '5.5'), Element(2, 'FORM', 'LINEAGE-LINKED')])]),\nIndividual(0, 'INDI', '@I1@', [Element(1, 'SEX', 'M')]),\nFamily(0, 'FAM', '@F2@'),\nElement(0, 'TRLR'))"))
 
     def testCanOnlyAddIndividualOrFamilyToFile(self):
@@ -125,25 +154,19 @@ class GedComTestCase(unittest.TestCase):
         title = gedcom.Element(tag="TITL")
         self.assertRaises(Exception, gedcomfile.add_element, (title))
 
-    def testCanAddIndividualRaw(self):
-        gedcomfile = gedcom.GedcomFile()
-        element = gedcom.Element(tag="INDI")
-        gedcomfile.add_element(element)
-
-    def testCanAddFamilyRaw(self):
-        gedcomfile = gedcom.GedcomFile()
-        element = gedcom.Element(tag="FAM")
-        gedcomfile.add_element(element)
-
-    def testCanAddIndividualObj(self):
-        gedcomfile = gedcom.GedcomFile()
-        element = gedcom.Individual()
-        gedcomfile.add_element(element)
-
-    def testCanAddFamilyObj(self):
-        gedcomfile = gedcom.GedcomFile()
-        element = gedcom.Family()
-        gedcomfile.add_element(element)
+    def testCanAddIndividualOrFamily(self):
+        # Plain loop rather than subTest, which is newer than Python 3.3
+        cases = [
+            ("raw INDI", lambda: gedcom.Element(tag="INDI")),
+            ("raw FAM", lambda: gedcom.Element(tag="FAM")),
+            ("Individual", gedcom.Individual),
+            ("Family", gedcom.Family),
+        ]
+        for label, make_element in cases:
+            gedcomfile = gedcom.GedcomFile()
+            element = make_element()
+            gedcomfile.add_element(element)
+            self.assertIn(element, gedcomfile.root_elements, label)
 
     def testIndividualIdsWork(self):
         gedcomfile = gedcom.GedcomFile()
@@ -158,30 +181,66 @@ class GedComTestCase(unittest.TestCase):
         self.assertEqual(element1.id, '@I1@')
         self.assertEqual(element2.id, '@I2@')
 
+    def testAddedElementsAreInFile(self):
+        gedcomfile = gedcom.GedcomFile()
+        individual = gedcom.Individual()
+        birth = gedcom.Birth()
+        individual.add_child_element(birth)
+        birth.add_child_element(gedcom.Element(tag="DATE", value="1980"))
+        gedcomfile.add_element(individual)
+        self.assertTrue(birth['DATE'].gedcom_file is gedcomfile)
+
     def testIdAssismentIsRobust(self):
-        gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n\n0 TRLR")
+        gedcomfile = gedcom.parse_string(BOB_COX_GIVN_SURN)
         element1 = gedcom.Individual()
         self.assertEqual(element1.id, None)
         gedcomfile.add_element(element1)
         self.assertEqual(element1.id, '@I2@')
 
     def testCanAutoDetectInputFP(self):
-        fp = six.StringIO(GEDCOM_FILE)
+        fp = io.StringIO(GEDCOM_FILE)
         parsed = gedcom.parse(fp)
         self.assertTrue(isinstance(parsed, gedcom.GedcomFile))
 
+    def testParseBinaryFP(self):
+        fp = io.BytesIO(codecs.BOM_UTF8 + u"0 HEAD\n0 @I1@ INDI\n1 NAME B\u00f6b /R\u00fc\u00dfel/\n0 TRLR".encode("utf8"))
+        parsed = gedcom.parse(fp)
+        self.assertEqual(first_individual(parsed).name, (u"B\u00f6b", u"R\u00fc\u00dfel"))
+
     def testCanAutoDetectInputString(self):
         parsed = gedcom.parse(GEDCOM_FILE)
         self.assertTrue(isinstance(parsed, gedcom.GedcomFile))
 
+    def testCanAutoDetectInputSingleLineString(self):
+        parsed = gedcom.parse("0 HEAD")
+        self.assertEqual(parsed.root_elements[0].tag, 'HEAD')
+        self.assertRaises(NotImplementedError, gedcom.parse, "x" * 5000)
+
+    def testCanAutoDetectInputBytes(self):
+        parsed = gedcom.parse(GEDCOM_FILE_UTF8)
+        self.assertEqual(len(list(parsed.individuals)), 3)
+
+    def testCanAutoDetectInputBytesWithBOM(self):
+        parsed = gedcom.parse(codecs.BOM_UTF8 + u"0 HEAD\n0 @I1@ INDI\n1 NAME B\u00f6b /R\u00fc\u00dfel/\n0 TRLR".encode("utf8"))
+        self.assertEqual(first_individual(parsed).name, (u"B\u00f6b", u"R\u00fc\u00dfel"))
+
     def testCanAutoDetectInputFilename(self):
         myfile = tempfile.NamedTemporaryFile()
         filename = myfile.name
         parsed = gedcom.parse(filename)
         self.assertTrue(isinstance(parsed, gedcom.GedcomFile))
 
+    def testParseFPInSmallBlocks(self):
+        old_read_size = gedcom._READ_SIZE
+        gedcom._READ_SIZE = 7
+        try:
+            parsed = gedcom.parse_fp(io.StringIO(GEDCOM_FILE.replace("\n", "\r\n")))
+        finally:
+            gedcom._READ_SIZE = old_read_size
+        self.assertEqual(parsed.gedcom_lines_as_string() + "\n", GEDCOM_FILE)
+
     def testSupportNameInGivenAndSurname(self):
-        gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n\n0 TRLR")
+        gedcomfile = gedcom.parse_string(BOB_COX_GIVN_SURN)
         self.assertEqual(gedcomfile['@I1@'].name, ('Bob', 'Cox'))
 
     def testSupportNameInOneWithSlashes(self):
@@ -189,21 +248,34 @@ class GedComTestCase(unittest.TestCase):
         self.assertEqual(gedcomfile['@I1@'].name, ('Bob', 'Cox'))
 
     def testSaveFile(self):
-        gedcomfile = gedcom.parse_string(GEDCOM_FILE)
+        gedcomfile = self.parsed_gedcomfile
+        output = io.BytesIO()
+        gedcomfile.save(output)
+        self.assertEqual(output.getvalue(), GEDCOM_FILE_UTF8)
+
+    def testSaveFilename(self):
+        gedcomfile = self.parsed_gedcomfile
         outputfile = tempfile.NamedTemporaryFile()
         outputfilename = outputfile.name
-        gedcomfile.save(outputfile)
-        outputfile.seek(0,0)
-        
-        self.assertEqual(outputfile.read(), GEDCOM_FILE.encode("utf8"))
         self.assertRaises(Exception, gedcomfile.save, (outputfilename))
         outputfile.close()
-        
+
         gedcomfile.save(outputfilename)
         with open(outputfilename) as output:
             self.assertEqual(output.read(), GEDCOM_FILE)
         remove(outputfilename)
 
+    def testSaveFileInBatches(self):
+        gedcomfile = self.parsed_gedcomfile
+        old_write_batch = gedcom._WRITE_BATCH
+        gedcom._WRITE_BATCH = 2
+        try:
+            output = io.BytesIO()
+            gedcomfile.save(output)
+        finally:
+            gedcom._WRITE_BATCH = old_write_batch
+        self.assertEqual(output.getvalue(), GEDCOM_FILE_UTF8)
+
     def testErrorWithBadTag(self):
         self.assertRaises(Exception, gedcom.Individual, [], {'tag': 'FAM'})
 
@@ -211,36 +283,97 @@ class GedComTestCase(unittest.TestCase):
         individual = gedcom.Individual(level='foo')
         self.assertRaises(Exception, individual.set_levels_downward)
 
+    def testElementLinesWithoutLevel(self):
+        element = gedcom.Element(tag="X", value="v")
+        child = gedcom.Element(tag="Y")
+        element.add_child_element(child)
+        self.assertEqual(len(list(element.gedcom_lines())), 2)
+        self.assertEqual(element.level, None)
+        self.assertEqual(child.level, None)
+
+    def testElementLinesDontChangeLevels(self):
+        element = gedcom.Element(level=3, tag="X", value="v")
+        element.add_child_element(gedcom.Element(level=7, tag="Y"))
+        self.assertEqual(list(element.gedcom_lines()), ["3 X v", "7 Y"])
+        self.assertEqual(element.child_elements[0].level, 7)
+
+    def testElementsShareTags(self):
+        gedcomfile = self.parsed_gedcomfile
+        bob, joann = list(gedcomfile.individuals)[:2]
+        self.assertFalse(hasattr(bob, '__dict__'))
+        self.assertTrue(bob['SEX'].tag is joann['SEX'].tag)
+        self.assertTrue(bob['SEX'].parent_element is bob)
+
+    def testParentsFollowChanges(self):
+        gedcomfile = gedcom.parse_string(GEDCOM_FILE)
+        bob, joann, bobby_jo = list(gedcomfile.individuals)
+        self.assertEqual(bobby_jo.father, bob)
+        bob.set_sex('F')
+        self.assertEqual(bobby_jo.father, None)
+        self.assertRaises(NotImplementedError, lambda: bobby_jo.mother)
+
+    def testCachedPropertyErrorsArentChained(self):
+        gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 SEX M\n0 TRLR")
+        with self.assertRaises(IndexError) as context:
+            first_individual(gedcomfile).name
+        self.assertIsNone(context.exception.__context__)
+
+    def testInvalidateAfterDirectChange(self):
+        gedcomfile = gedcom.parse_string(GEDCOM_FILE)
+        bob, joann, bobby_jo = list(gedcomfile.individuals)
+        self.assertEqual(bobby_jo.name, ('Bobby Jo', 'Cox'))
+        bobby_jo['NAME'].value = 'Bobby /Cox/'
+        bobby_jo['NAME'].invalidate()
+        self.assertEqual(bobby_jo.name, ('Bobby', 'Cox'))
+        bob['SEX'].value = 'F'
+        bob['SEX'].invalidate()
+        self.assertEqual(bobby_jo.father, None)
+
+    def testInvalidateAfterRemovingChild(self):
+        element = gedcom.Element(level=0, tag="X")
+        for i in range(gedcom._INDEX_MIN_CHILDREN):
+            element.add_child_element(gedcom.Element(tag="A", value=str(i)))
+        name = gedcom.Element(tag="NAME", value="Bob /Cox/")
+        element.add_child_element(name)
+        self.assertIs(element['NAME'], name)
+        element.child_elements.remove(name)
+        element.invalidate()
+        self.assertNotIn('NAME', element)
+
     def testNote(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 NOTE foo\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].note, 'foo')
+        self.assertEqual(first_individual(gedcomfile).note, 'foo')
 
     def testNoteCont(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 NOTE foo\n2 CONT bar\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].note, 'foo\nbar')
+        self.assertEqual(first_individual(gedcomfile).note, 'foo\nbar')
 
     def testNoteConc(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 NOTE foo\n2 CONC bar\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].note, 'foobar')
+        self.assertEqual(first_individual(gedcomfile).note, 'foobar')
+
+    def testNoteWithoutValue(self):
+        gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NOTE\n2 CONC foo\n2 CONT bar\n0 TRLR")
+        self.assertEqual(first_individual(gedcomfile).note, 'foo\nbar')
 
     def testNoteError(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 NOTE foo\n2 TITL bar\n0 TRLR")
-        ind = list(gedcomfile.individuals)[0]
+        ind = first_individual(gedcomfile)
         self.assertRaises(ValueError, lambda : ind.note)
 
     def testBirth(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 BIRT\n2 DATE 1980\n2 PLAC London\n0 TRLR")
-        ind = list(gedcomfile.individuals)[0]
+        ind = first_individual(gedcomfile)
         birth = ind.birth
-        self.assertEquals(birth.place, "London")
-        self.assertEquals(birth.date, "1980")
+        self.assertEqual(birth.place, "London")
+        self.assertEqual(birth.date, "1980")
 
     def testDeath(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 DEAT\n2 DATE 1980\n2 PLAC London\n0 TRLR")
-        ind = list(gedcomfile.individuals)[0]
+        ind = first_individual(gedcomfile)
         death = ind.death
-        self.assertEquals(death.place, "London")
-        self.assertEquals(death.date, "1980")
+        self.assertEqual(death.place, "London")
+        self.assertEqual(death.date, "1980")
 
     def testSetSex(self):
         gedcomfile = gedcom.GedcomFile()
@@ -255,40 +388,64 @@ class GedComTestCase(unittest.TestCase):
 
     def testTitle(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n1 TITL King\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].title, 'King')
+        self.assertEqual(first_individual(gedcomfile).title, 'King')
 
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n2 SURN Cox\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].title, None)
+        self.assertEqual(first_individual(gedcomfile).title, None)
 
     def testParseError(self):
         self.assertRaises(Exception, gedcom.parse_string, "foo")
+        self.assertRaises(NotImplementedError, gedcom.parse_string, "0 HEAD\n0 @I1@ INDI\nfoo\n0 TRLR")
+
+    def testParseCRLFAndBlankLines(self):
+        gedcomfile = gedcom.parse_string("0 HEAD\r\n\r\n  0 @I1@ INDI\r\n1 NAME Bob /Cox/  \r\n0 TRLR\r\n")
+        self.assertEqual(first_individual(gedcomfile).name, ('Bob', 'Cox'))
+        self.assertEqual(gedcomfile.gedcom_lines_as_string(), "0 HEAD\n0 @I1@ INDI\n1 NAME Bob /Cox/\n0 TRLR")
+
+    def testLookupChildrenByTagOnWideElement(self):
+        element = gedcom.Element(level=0, tag="X")
+        for i in range(gedcom._INDEX_MIN_CHILDREN * 2):
+            element.add_child_element(gedcom.Element(tag="A", value=str(i)))
+        element.add_child_element(gedcom.Element(tag="B", value="b"))
+        self.assertEqual(element['B'].value, "b")
+        self.assertEqual(len(element.get_list('A')), gedcom._INDEX_MIN_CHILDREN * 2)
+        self.assertNotIn('C', element)
+        element.add_child_element(gedcom.Element(tag="C", value="c"))
+        self.assertEqual(element['C'].value, "c")
+        self.assertEqual(element.get_list('B'), [element.child_elements[-2]])
+
+    def testParseTrailingUnicodeWhitespace(self):
+        # e.g. a no-break space at the end of a line is trimmed like any other whitespace
+        for space in (u"\u00a0", u"\x0b", u"\x0c", u"\x85", u"\u3000"):
+            gedcomfile = gedcom.parse_string(u"0 HEAD\n0 @I1@ INDI\n1 NAME Bob /Cox/" + space + u"\n0 TRLR")
+            self.assertEqual(first_individual(gedcomfile)['NAME'].value, 'Bob /Cox/', repr(space))
 
     def testFirstNameOnly1(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 GIVN Bob\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].name, ('Bob', None))
+        self.assertEqual(first_individual(gedcomfile).name, ('Bob', None))
 
     def testFirstNameOnly2(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME Bob\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].name, ('Bob', None))
+        self.assertEqual(first_individual(gedcomfile).name, ('Bob', None))
 
     def testLastNameOnly1(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME\n2 SURN Bob\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].name, (None, 'Bob'))
+        self.assertEqual(first_individual(gedcomfile).name, (None, 'Bob'))
 
     def testEmptyName(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME \n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].name, (None, None))
+        self.assertEqual(first_individual(gedcomfile).name, (None, None))
 
     def testInvalidNames(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1@ INDI\n1 NAME Bob /Russel\n0 TRLR")
-        self.assertRaises(Exception, lambda : list(gedcomfile.individuals)[0].name)
+        self.assertRaises(Exception, lambda : first_individual(gedcomfile).name)
 
     def testDashInID(self):
         gedcomfile = gedcom.parse_string("0 HEAD\n0 @I1-123@ INDI\n1 NAME\n2 GIVN Bob\n0 TRLR")
-        self.assertEqual(list(gedcomfile.individuals)[0].name, ('Bob', None))
+        self.assertEqual(first_individual(gedcomfile).name, ('Bob', None))
 
     def testFamilies(self):
-        gedcomfile = gedcom.parse_string(GEDCOM_FILE)
+        gedcomfile = self.parsed_gedcomfile
         fam = list(gedcomfile.families)[0]
 
         self.assertEqual(len(fam.husbands), 1)